@@ -20,13 +20,15 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Configure CrewAI to use GitHub Models API
-# CrewAI internally uses OpenAI client, so we configure it to point to GitHub's endpoint
+# CrewAI internally uses OpenAI client, so we configure it to point to GitHub's endpoint.
+# setdefault keeps explicitly exported OPENAI_* values intact instead of
+# silently overwriting them at import time.
 github_token = os.getenv("GITHUB_TOKEN")
 if github_token:
     # Use GitHub token as the API key
-    os.environ["OPENAI_API_KEY"] = github_token
+    os.environ.setdefault("OPENAI_API_KEY", github_token)
     # Point to GitHub Models endpoint (OpenAI-compatible)
-    os.environ["OPENAI_API_BASE"] = "https://models.inference.ai.azure.com"
+    os.environ.setdefault("OPENAI_API_BASE", "https://models.inference.ai.azure.com")
 
 console = Console()
 
@@ -45,14 +47,25 @@ def print_banner():
     console.print(Panel(banner, style="bold blue"))
 
 
+# Provider credentials probed in preference order; `key in os.environ`
+# is a single dict hit per entry (os.getenv adds default handling)
+_PROVIDER_PROBE = (
+    ('GITHUB_TOKEN', 'github'),
+    ('OPENAI_API_KEY', 'openai'),
+    ('ANTHROPIC_API_KEY', 'anthropic'),
+)
+
+
+def _detect_provider():
+    """Return the first configured provider name, or None."""
+    env = os.environ
+    return next((provider for key, provider in _PROVIDER_PROBE if env.get(key)), None)
+
+
 def check_environment():
     """Check if required environment variables are set."""
     # Check if ANY provider is configured
-    github_token = os.getenv('GITHUB_TOKEN')
-    openai_key = os.getenv('OPENAI_API_KEY')
-    anthropic_key = os.getenv('ANTHROPIC_API_KEY')
-    
-    if not any([github_token, openai_key, anthropic_key]):
+    if _detect_provider() is None:
         console.print("\n[bold red]⚠️  Configuración Incompleta[/bold red]\n")
         console.print("No se encontró ningún proveedor de IA configurado.")
         console.print("\n[bold]Configura UNO de los siguientes:[/bold]")
@@ -3,24 +3,42 @@ Multi-Agent Web Development System - Tools Module
 
 This module contains tools that agents can use to perform various tasks.
 Tools are shared across agents and provide specific functionality.
+
+Submodules are imported lazily (PEP 562): importing `tools` no longer
+pays for every tool's dependencies (web research pulls in HTTP stacks,
+testing tools pull in subprocess plumbing) when an agent only needs one
+of them.
 """
 
-from .web_research import WebResearchTool, SearchTool
-from .code_generator import CodeGeneratorTool, FlaskAppGenerator, ReactAppGenerator
-from .file_operations import FileOperationsTool, ProjectStructureTool
-from .testing_tools import TestRunnerTool, CoverageAnalyzerTool
-from .deployment_tools import DockerTool, CICDTool
-
-__all__ = [
-    'WebResearchTool',
-    'SearchTool',
-    'CodeGeneratorTool',
-    'FlaskAppGenerator',
-    'ReactAppGenerator',
-    'FileOperationsTool',
-    'ProjectStructureTool',
-    'TestRunnerTool',
-    'CoverageAnalyzerTool',
-    'DockerTool',
-    'CICDTool',
-]
+import importlib
+
+# Exported name -> defining submodule
+_LAZY = {
+    'WebResearchTool': 'web_research',
+    'SearchTool': 'web_research',
+    'CodeGeneratorTool': 'code_generator',
+    'FlaskAppGenerator': 'code_generator',
+    'ReactAppGenerator': 'code_generator',
+    'FileOperationsTool': 'file_operations',
+    'ProjectStructureTool': 'file_operations',
+    'TestRunnerTool': 'testing_tools',
+    'CoverageAnalyzerTool': 'testing_tools',
+    'DockerTool': 'deployment_tools',
+    'CICDTool': 'deployment_tools',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
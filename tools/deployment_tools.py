@@ -1,3 +1,301 @@
-# Deployment tools placeholder
-DockerTool = None
-CICDTool = None
+"""
+Deployment Tools
+
+Generators for Dockerfiles, docker-compose stacks, GitHub Actions
+workflows and nginx configuration used by the DevOps agent.
+
+All generators are pure functions of their arguments, so their outputs
+are memoized with functools.lru_cache — agents tend to re-request the
+same artifacts several times per run.
+"""
+
+import functools
+import string
+from typing import Optional
+
+_PORT_BY_TYPE = {
+    "flask": 5000,
+    "fastapi": 8000,
+    "react": 3000,
+}
+
+# Static template preambles. These artifacts end up in LLM context, and
+# prompt caches only match on an unchanged prefix — so the long invariant
+# blocks come first and all parametric lines (EXPOSE/HEALTHCHECK/CMD)
+# are appended at the tail.
+_DOCKERFILE_PY_STATIC = """# Python production image
+# Base version defaults to 3.11; pass python_version to override.
+FROM python:3.11-slim AS builder
+WORKDIR /app
+COPY requirements.txt .
+RUN pip install --no-cache-dir --prefix=/install -r requirements.txt
+
+FROM python:3.11-slim
+WORKDIR /app
+COPY --from=builder /install /usr/local
+COPY . .
+"""
+
+_DOCKERFILE_REACT_STATIC = """# React production image
+FROM node:20-alpine AS builder
+WORKDIR /app
+COPY package*.json ./
+RUN npm ci
+COPY . .
+RUN npm run build
+
+FROM nginx:alpine
+COPY --from=builder /app/build /usr/share/nginx/html
+"""
+
+
+@functools.lru_cache(maxsize=128)
+def _build_dockerfile(project_type: str, python_version: str, port: int) -> str:
+    """Slow-path Dockerfile build; cached per exact argument triple."""
+    if project_type == "react":
+        return _DOCKERFILE_REACT_STATIC + f'EXPOSE {port}\nCMD ["nginx", "-g", "daemon off;"]\n'
+
+    static = _DOCKERFILE_PY_STATIC
+    if python_version != "3.11":
+        static = static.replace("python:3.11-slim", f"python:{python_version}-slim")
+
+    server_cmd = (
+        f'CMD ["gunicorn", "-b", "0.0.0.0:{port}", "run:app"]'
+        if project_type == "flask"
+        else f'CMD ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "{port}"]'
+    )
+    return (
+        static
+        + f"EXPOSE {port}\n"
+        + f"HEALTHCHECK --interval=30s --timeout=3s CMD curl -f http://localhost:{port}/health || exit 1\n"
+        + server_cmd
+        + "\n"
+    )
+
+
+# Dockerfiles for the combinations agents actually request, built once at
+# import so the common case is a plain dict hit with no call into the
+# template machinery at all.
+_DOCKERFILE_TABLE = {
+    key: _build_dockerfile(*key)
+    for key in (
+        ("flask", "3.11", 5000),
+        ("flask", "3.12", 5000),
+        ("fastapi", "3.11", 8000),
+        ("fastapi", "3.12", 8000),
+        ("react", "3.11", 3000),
+        ("react", "3.12", 3000),
+    )
+}
+
+
+def generate_dockerfile(project_type: str, python_version: str = "3.11", port: Optional[int] = None) -> str:
+    """
+    Generate a production Dockerfile for the given project type.
+
+    Args:
+        project_type: Type of project (flask, fastapi, react)
+        python_version: Python base image version (ignored for react)
+        port: Port the container exposes (defaults per project type)
+
+    Returns:
+        str: Dockerfile content
+    """
+    if port is None:
+        port = _PORT_BY_TYPE.get(project_type, 5000)
+    key = (project_type, python_version, port)
+    cached = _DOCKERFILE_TABLE.get(key)
+    if cached is not None:
+        return cached
+    content = _build_dockerfile(project_type, python_version, port)
+    _DOCKERFILE_TABLE[key] = content
+    return content
+
+
+@functools.lru_cache(maxsize=8)
+def generate_docker_compose(
+    include_db: bool = True, include_cache: bool = False, include_nginx: bool = False
+) -> str:
+    """
+    Generate a docker-compose.yml for the selected services.
+
+    Args:
+        include_db: Include a PostgreSQL service
+        include_cache: Include a Redis service
+        include_nginx: Include an nginx reverse-proxy service
+
+    Returns:
+        str: docker-compose.yml content
+    """
+    parts = [
+        """services:
+  backend:
+    build: ./backend
+    ports:
+      - "5000:5000"
+    env_file:
+      - ./backend/.env
+"""
+    ]
+    if include_db:
+        parts.append(
+            """    depends_on:
+      - db
+
+  db:
+    image: postgres:16-alpine
+    environment:
+      POSTGRES_DB: appdb
+      POSTGRES_USER: app
+      POSTGRES_PASSWORD: ${POSTGRES_PASSWORD:-changeme}
+    volumes:
+      - pgdata:/var/lib/postgresql/data
+"""
+        )
+    if include_cache:
+        parts.append(
+            """
+  redis:
+    image: redis:7-alpine
+    ports:
+      - "6379:6379"
+"""
+        )
+    if include_nginx:
+        parts.append(
+            """
+  nginx:
+    image: nginx:alpine
+    ports:
+      - "80:80"
+    volumes:
+      - ./nginx.conf:/etc/nginx/conf.d/default.conf:ro
+    depends_on:
+      - backend
+"""
+        )
+    if include_db:
+        parts.append("\nvolumes:\n  pgdata:\n")
+    return "".join(parts)
+
+
+# Workflow scaffolding is fully static; only a trailing annotation varies,
+# keeping the cacheable prefix as large as possible (see Dockerfile note).
+_GHA_NODE_STATIC = """name: CI
+
+on:
+  push:
+    branches: [main]
+  pull_request:
+
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - uses: actions/setup-node@v4
+        with:
+          node-version: 20
+      - run: npm ci
+      - run: npm test -- --watchAll=false
+      - run: npm run build
+"""
+
+_GHA_PY_STATIC = """name: CI
+
+on:
+  push:
+    branches: [main]
+  pull_request:
+
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - uses: actions/setup-python@v5
+        with:
+          python-version: "3.11"
+      - run: pip install -r requirements.txt
+      - run: flake8 app/ tests/
+      - run: pytest -v --cov=app
+"""
+
+
+@functools.lru_cache(maxsize=16)
+def generate_github_actions(project_type: str) -> str:
+    """
+    Generate a GitHub Actions CI workflow for the given project type.
+
+    Args:
+        project_type: Type of project (flask, fastapi, react)
+
+    Returns:
+        str: .github/workflows/ci.yml content
+    """
+    if project_type == "react":
+        return _GHA_NODE_STATIC + f"# project type: {project_type}\n"
+
+    return _GHA_PY_STATIC + f"# project type: {project_type}\n"
+
+
+# Parsed once at import; f-string templates re-parse the whole block (and
+# need every literal nginx brace doubled) on each call. Literal nginx
+# variables are written as $$host etc. to escape Template's $ syntax.
+_NGINX_TPL = string.Template(
+    """server {
+    listen 80;
+    server_name ${domain};
+
+    location /api/ {
+        proxy_pass http://127.0.0.1:${backend_port}/;
+        proxy_set_header Host $$host;
+        proxy_set_header X-Real-IP $$remote_addr;
+        proxy_set_header X-Forwarded-For $$proxy_add_x_forwarded_for;
+    }
+
+    location / {
+        proxy_pass http://127.0.0.1:${frontend_port}/;
+        proxy_set_header Host $$host;
+        proxy_set_header Upgrade $$http_upgrade;
+        proxy_set_header Connection "upgrade";
+    }
+}
+"""
+)
+
+
+@functools.lru_cache(maxsize=64)
+def generate_nginx_config(domain: str, backend_port: int = 5000, frontend_port: int = 3000) -> str:
+    """
+    Generate an nginx reverse-proxy configuration.
+
+    Args:
+        domain: Server name the proxy answers to
+        backend_port: Port of the backend service
+        frontend_port: Port of the frontend service
+
+    Returns:
+        str: nginx server block content
+    """
+    return _NGINX_TPL.substitute(
+        domain=domain, backend_port=backend_port, frontend_port=frontend_port
+    )
+
+
+# The wrapper classes bind the module functions directly; a def-method
+# indirection here only added an extra Python frame per tool dispatch.
+class DockerTool:
+    """Tool wrapper around the Docker artifact generators."""
+
+    dockerfile = staticmethod(generate_dockerfile)
+    compose = staticmethod(generate_docker_compose)
+    cache_clear = staticmethod(_build_dockerfile.cache_clear)
+
+
+class CICDTool:
+    """Tool wrapper around the CI/CD and proxy config generators."""
+
+    github_actions = staticmethod(generate_github_actions)
+    nginx = staticmethod(generate_nginx_config)
+    cache_clear = staticmethod(generate_github_actions.cache_clear)
@@ -1,3 +1,499 @@
-# Testing tools placeholder
-TestRunnerTool = None
-CoverageAnalyzerTool = None
+"""
+Testing Tools
+
+Wrappers around pytest, coverage, flake8, black and npm that the QA
+agent runs against generated projects. Helpers return human-readable
+report strings (Status: PASSED/FAILED) rather than raising, so agents
+can reason about the outcome.
+
+Each helper has an async-native `a*` variant built on
+asyncio.create_subprocess_exec, so concurrent tool dispatch composes
+with an async agent pipeline without blocking the event loop; the sync
+names are thin asyncio.run wrappers kept for the @tool decorators.
+"""
+
+import asyncio
+import contextlib
+import functools
+import importlib.util
+import io
+import os
+import shutil
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+# Absolute tool paths, resolved once per process. Every subprocess spawn
+# with a bare name re-walks $PATH (notably slow on Windows).
+_TOOL_PATHS: Dict[str, str] = {}
+
+
+def _resolve(tool: str) -> str:
+    """Resolve a tool binary through $PATH once and memoize it."""
+    path = _TOOL_PATHS.get(tool)
+    if path is None:
+        path = _TOOL_PATHS.setdefault(tool, shutil.which(tool) or tool)
+    return path
+
+
+@functools.lru_cache(maxsize=1)
+def _xdist_available() -> bool:
+    """Probe once whether pytest-xdist is importable."""
+    return importlib.util.find_spec("xdist") is not None
+
+
+# Child output is read as raw bytes and decoded once; text=True decodes
+# eagerly inside subprocess with the strict codec. Anything beyond
+# _MAX_TOOL_OUTPUT is cut before it reaches the LLM — the agent can't use
+# more and the extra tokens cost real money downstream.
+_MAX_TOOL_OUTPUT = 256 * 1024
+
+
+def _decode_output(raw: bytes) -> str:
+    """Decode child output bytes, truncating oversized streams."""
+    if len(raw) > _MAX_TOOL_OUTPUT:
+        raw = raw[:_MAX_TOOL_OUTPUT]
+        return raw.decode("utf-8", errors="replace") + "\n... [output truncated at 256 KB]"
+    return raw.decode("utf-8", errors="replace")
+
+
+async def _aexec(
+    cmd: List[str], timeout: int, cwd: str, env: Optional[dict] = None
+) -> Tuple[int, bytes, bytes]:
+    """Spawn a child process and collect its output without blocking the loop."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except (asyncio.TimeoutError, TimeoutError):
+        proc.kill()
+        await proc.communicate()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return proc.returncode or 0, stdout, stderr
+
+
+# Banner pytest-cov prints before its summary table; used to split the
+# fused run's output back into test and coverage sections.
+_COV_BANNER = "---------- coverage:"
+
+# Quality-report framing, built once at import
+_BANNER = "=" * 60
+_HEADER = f"{_BANNER}\nCODE QUALITY REPORT\n{_BANNER}"
+_SEPARATOR = "-" * 60
+
+# Incremental-run bookkeeping, stored alongside pytest's own cache
+_MTIME_FILE = os.path.join(".pytest_cache", "previous_run_mtime")
+_RESULT_FILE = os.path.join(".pytest_cache", "previous_run_result.txt")
+
+
+def _tree_mtime(project_path: str) -> float:
+    """Newest mtime across the project's app/ and tests/ trees."""
+    newest = 0.0
+    for sub in ("app", "tests"):
+        for root, _dirs, names in os.walk(os.path.join(project_path, sub)):
+            for name in names:
+                try:
+                    newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+                except OSError:
+                    continue
+    return newest
+
+
+def _load_cached_result(project_path: str, current_mtime: float) -> Optional[str]:
+    """Return the previous run's report if no source changed since."""
+    try:
+        with open(os.path.join(project_path, _MTIME_FILE)) as f:
+            if float(f.read().strip()) != current_mtime:
+                return None
+        with open(os.path.join(project_path, _RESULT_FILE)) as f:
+            return f.read()
+    except (OSError, ValueError):
+        return None
+
+
+def _store_result(project_path: str, current_mtime: float, report: str) -> None:
+    """Persist the run's report keyed by the source tree mtime."""
+    try:
+        os.makedirs(os.path.join(project_path, ".pytest_cache"), exist_ok=True)
+        with open(os.path.join(project_path, _MTIME_FILE), "w") as f:
+            f.write(str(current_mtime))
+        with open(os.path.join(project_path, _RESULT_FILE), "w") as f:
+            f.write(report)
+    except OSError:
+        pass
+
+
+async def _arun_tests_with_coverage(
+    project_path: str,
+    html: bool = False,
+    workers: Optional[int] = None,
+    changed_only: bool = False,
+) -> str:
+    """
+    Run the pytest suite once, under coverage instrumentation.
+
+    Running tests and coverage as separate pytest invocations executes the
+    whole suite twice; one instrumented run produces both results.
+
+    Pytest's own .pytest_cache and the project's .coverage file are left
+    in place between runs so collection and coverage analysis warm up
+    across repeated quality checks. Coverage uses the PEP 669 sys.monitoring
+    core (COVERAGE_CORE=sysmon) on Python 3.12+, which is far cheaper than
+    the sys.settrace default.
+
+    When pytest-xdist is installed the suite runs across all cores
+    (-n auto --dist=loadfile; loadfile keeps session fixtures from being
+    rebuilt per worker). Generated projects should add pytest-xdist to
+    their requirements to benefit.
+
+    Args:
+        project_path: Root of the generated project
+        html: Also write an HTML report to htmlcov/
+        workers: Worker count override (default: PYTEST_WORKERS env or auto)
+        changed_only: Prioritize previously failed tests via pytest's cache
+            (--lf --ff) instead of running the suite front to back
+
+    Returns:
+        str: Combined test + coverage output with a Status line
+    """
+    cmd = [_resolve("pytest"), "-v", "--cov=app", "--cov-report=term"]
+    if html:
+        cmd.append("--cov-report=html")
+    if changed_only:
+        cmd += ["--lf", "--ff"]
+    if _xdist_available():
+        n = str(workers) if workers else os.getenv("PYTEST_WORKERS", "auto")
+        cmd += ["-n", n, "--dist=loadfile"]
+    env = dict(os.environ)
+    env.setdefault("COVERAGE_CORE", "sysmon")
+    env.setdefault("COVERAGE_FILE", os.path.join(project_path, ".coverage"))
+    try:
+        returncode, stdout, stderr = await _aexec(cmd, 300, project_path, env)
+        status = "PASSED" if returncode == 0 else "FAILED"
+        return f"Status: {status}\n\n{_decode_output(stdout)}\n{_decode_output(stderr)}"
+    except FileNotFoundError:
+        return "Status: FAILED\npytest/pytest-cov is not installed"
+    except subprocess.TimeoutExpired:
+        return "Status: FAILED\nTest run timed out after 300s"
+
+
+def _run_tests_with_coverage(
+    project_path: str,
+    html: bool = False,
+    workers: Optional[int] = None,
+    changed_only: bool = False,
+) -> str:
+    """Sync wrapper over the fused async coverage run."""
+    return asyncio.run(
+        _arun_tests_with_coverage(project_path, html, workers, changed_only)
+    )
+
+
+def _split_test_and_coverage(combined: str) -> tuple:
+    """Split a fused run's output at the pytest-cov banner."""
+    idx = combined.find(_COV_BANNER)
+    if idx == -1:
+        return combined, combined
+    status_line = combined.split("\n", 1)[0]
+    return combined[:idx].rstrip(), f"{status_line}\n\n{combined[idx:]}"
+
+
+async def arun_python_tests(
+    project_path: str, workers: Optional[int] = None, changed_only: bool = False
+) -> str:
+    """
+    Run the project's pytest suite.
+
+    Thin wrapper over the fused coverage run; see _arun_tests_with_coverage.
+
+    Runs are incremental: when nothing under app/ or tests/ changed since
+    the previous invocation, the stored report is returned without
+    spawning pytest at all (agents often call the quality tool twice in a
+    row). When sources did change and the previous run failed, the failing
+    set runs first via pytest's own cache (--lf --ff).
+
+    Args:
+        project_path: Root of the generated project
+        workers: Worker count override (default: PYTEST_WORKERS env or auto)
+        changed_only: Run previously failed tests first (--lf --ff)
+
+    Returns:
+        str: Test report with a Status line
+    """
+    current_mtime = _tree_mtime(project_path)
+    cached = _load_cached_result(project_path, current_mtime)
+    if cached is not None:
+        return cached
+
+    if not changed_only:
+        try:
+            with open(os.path.join(project_path, _RESULT_FILE)) as f:
+                changed_only = "Status: FAILED" in f.read()
+        except OSError:
+            pass
+
+    combined = await _arun_tests_with_coverage(
+        project_path, workers=workers, changed_only=changed_only
+    )
+    tests, _ = _split_test_and_coverage(combined)
+    report = f"PYTEST RESULTS\n{tests}"
+    _store_result(project_path, current_mtime, report)
+    return report
+
+
+def run_python_tests(
+    project_path: str, workers: Optional[int] = None, changed_only: bool = False
+) -> str:
+    """Sync wrapper over arun_python_tests (for the @tool decorators)."""
+    return asyncio.run(arun_python_tests(project_path, workers, changed_only))
+
+
+async def agenerate_coverage_report(project_path: str, html: bool = False) -> str:
+    """
+    Run pytest under coverage and report the summary.
+
+    Thin wrapper over the fused coverage run; see _arun_tests_with_coverage.
+
+    Args:
+        project_path: Root of the generated project
+        html: Also write an HTML report to htmlcov/
+
+    Returns:
+        str: Coverage report with a Status line
+    """
+    combined = await _arun_tests_with_coverage(project_path, html=html)
+    _, coverage = _split_test_and_coverage(combined)
+    return f"COVERAGE REPORT\n{coverage}"
+
+
+def generate_coverage_report(project_path: str, html: bool = False) -> str:
+    """Sync wrapper over agenerate_coverage_report."""
+    return asyncio.run(agenerate_coverage_report(project_path, html))
+
+
+async def arun_javascript_tests(project_path: str) -> str:
+    """
+    Run the frontend's npm test suite.
+
+    Args:
+        project_path: Root of the frontend project
+
+    Returns:
+        str: Test report with a Status line
+    """
+    try:
+        returncode, stdout, stderr = await _aexec(
+            [_resolve("npm"), "test", "--", "--watchAll=false"], 300, project_path
+        )
+        status = "PASSED" if returncode == 0 else "FAILED"
+        return f"NPM TEST RESULTS\nStatus: {status}\n\n{_decode_output(stdout)}\n{_decode_output(stderr)}"
+    except FileNotFoundError:
+        return "NPM TEST RESULTS\nStatus: FAILED\nnpm is not installed"
+    except subprocess.TimeoutExpired:
+        return "NPM TEST RESULTS\nStatus: FAILED\nTest run timed out after 300s"
+
+
+def run_javascript_tests(project_path: str) -> str:
+    """Sync wrapper over arun_javascript_tests."""
+    return asyncio.run(arun_javascript_tests(project_path))
+
+
+# flake8 and black are importable libraries; calling them in-process
+# skips a full interpreter startup (~150-250 ms each) per quality check.
+# The subprocess path stays as the fallback when they aren't installed
+# in this interpreter (e.g. only on the generated project's venv PATH).
+@functools.lru_cache(maxsize=1)
+def _flake8_importable() -> bool:
+    return importlib.util.find_spec("flake8") is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _black_importable() -> bool:
+    return importlib.util.find_spec("black") is not None
+
+
+def _lint_in_process(project_path: str, files: Optional[List[str]]) -> Optional[str]:
+    """Run flake8 via its Python API; None means fall back to subprocess."""
+    if not _flake8_importable():
+        return None
+    try:
+        from flake8.main.application import Application
+
+        targets = [os.path.join(project_path, t) for t in (files or ["app/", "tests/"])]
+        buf = io.StringIO()
+        app = Application()
+        with contextlib.redirect_stdout(buf):
+            app.run(targets)
+        status = "PASSED" if app.result_count == 0 else "FAILED"
+        body = buf.getvalue().strip() or "No issues found"
+        return f"FLAKE8 RESULTS\nStatus: {status}\n\n{body}"
+    except Exception:
+        return None
+
+
+def _format_in_process(project_path: str, check_only: bool) -> Optional[str]:
+    """Run black via its Python API; None means fall back to subprocess."""
+    if not _black_importable():
+        return None
+    try:
+        from black import main as black_main
+
+        args = [os.path.join(project_path, "app"), os.path.join(project_path, "tests")]
+        if check_only:
+            args.append("--check")
+        buf = io.StringIO()
+        code = 0
+        try:
+            with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+                black_main(args=args, standalone_mode=False)
+        except SystemExit as e:
+            code = int(e.code or 0)
+        status = "PASSED" if code == 0 else "FAILED"
+        return f"BLACK RESULTS\nStatus: {status}\n\n{buf.getvalue()}"
+    except Exception:
+        return None
+
+
+async def alint_python_code(project_path: str, files: Optional[List[str]] = None) -> str:
+    """
+    Lint the project with flake8.
+
+    Runs flake8 in-process when importable (no interpreter startup),
+    falling back to the subprocess otherwise.
+
+    Args:
+        project_path: Root of the generated project
+        files: Specific files to lint (defaults to app/ and tests/)
+
+    Returns:
+        str: Lint report with a Status line
+    """
+    report = await asyncio.to_thread(_lint_in_process, project_path, files)
+    if report is not None:
+        return report
+    targets = files or ["app/", "tests/"]
+    try:
+        returncode, stdout, _stderr = await _aexec(
+            [_resolve("flake8"), *targets], 120, project_path
+        )
+        status = "PASSED" if returncode == 0 else "FAILED"
+        body = _decode_output(stdout).strip() or "No issues found"
+        return f"FLAKE8 RESULTS\nStatus: {status}\n\n{body}"
+    except FileNotFoundError:
+        return "FLAKE8 RESULTS\nStatus: FAILED\nflake8 is not installed"
+    except subprocess.TimeoutExpired:
+        return "FLAKE8 RESULTS\nStatus: FAILED\nLint run timed out after 120s"
+
+
+def lint_python_code(project_path: str, files: Optional[List[str]] = None) -> str:
+    """Sync wrapper over alint_python_code."""
+    return asyncio.run(alint_python_code(project_path, files))
+
+
+async def aformat_python_code(project_path: str, check_only: bool = False) -> str:
+    """
+    Format (or check formatting of) the project with black.
+
+    Runs black in-process when importable (no interpreter startup),
+    falling back to the subprocess otherwise.
+
+    Args:
+        project_path: Root of the generated project
+        check_only: Only report what would change, don't rewrite files
+
+    Returns:
+        str: Format report with a Status line
+    """
+    report = await asyncio.to_thread(_format_in_process, project_path, check_only)
+    if report is not None:
+        return report
+    cmd = [_resolve("black"), "app/", "tests/"]
+    if check_only:
+        cmd.append("--check")
+    try:
+        returncode, stdout, stderr = await _aexec(cmd, 120, project_path)
+        status = "PASSED" if returncode == 0 else "FAILED"
+        return f"BLACK RESULTS\nStatus: {status}\n\n{_decode_output(stdout)}\n{_decode_output(stderr)}"
+    except FileNotFoundError:
+        return "BLACK RESULTS\nStatus: FAILED\nblack is not installed"
+    except subprocess.TimeoutExpired:
+        return "BLACK RESULTS\nStatus: FAILED\nFormat run timed out after 120s"
+
+
+def format_python_code(project_path: str, check_only: bool = False) -> str:
+    """Sync wrapper over aformat_python_code."""
+    return asyncio.run(aformat_python_code(project_path, check_only))
+
+
+async def acheck_code_quality(project_path: str) -> str:
+    """
+    Run the full quality gate: tests, coverage, lint and format check.
+
+    Tests and coverage come from a single instrumented pytest run whose
+    output is split at the coverage banner — running the suite twice
+    (once plain, once under coverage) doubled the dominant cost. The
+    phases are independent subprocesses awaited concurrently, so the
+    wall-clock cost collapses to the slowest phase instead of the sum,
+    with no thread pool needed.
+
+    With CREW_QUALITY_FAIL_FAST=1 the gate returns a partial report as
+    soon as the test run fails, cancelling the lint and format phases —
+    during agentic refinement loops broken code is the common case, and
+    style feedback on code that doesn't pass tests is wasted time.
+
+    Args:
+        project_path: Root of the generated project
+
+    Returns:
+        str: Combined quality report
+    """
+    test_task = asyncio.ensure_future(_arun_tests_with_coverage(project_path))
+    lint_task = asyncio.ensure_future(alint_python_code(project_path))
+    fmt_task = asyncio.ensure_future(aformat_python_code(project_path, check_only=True))
+
+    combined = await test_task
+    tests, coverage = _split_test_and_coverage(combined)
+
+    if "Status: FAILED" in combined and os.getenv("CREW_QUALITY_FAIL_FAST") == "1":
+        lint_task.cancel()
+        fmt_task.cancel()
+        await asyncio.gather(lint_task, fmt_task, return_exceptions=True)
+        return (
+            f"{_HEADER}\n"
+            f"PYTEST RESULTS\n{tests}\n{_SEPARATOR}\n"
+            "Lint and format checks skipped: tests failed (CREW_QUALITY_FAIL_FAST=1)"
+        )
+
+    lint, fmt = await asyncio.gather(lint_task, fmt_task)
+    return (
+        f"{_HEADER}\n"
+        f"PYTEST RESULTS\n{tests}\n{_SEPARATOR}\n"
+        f"COVERAGE REPORT\n{coverage}\n{_SEPARATOR}\n"
+        f"{lint}\n{_SEPARATOR}\n"
+        f"{fmt}\n{_SEPARATOR}"
+    )
+
+
+def check_code_quality(project_path: str) -> str:
+    """Sync wrapper over acheck_code_quality."""
+    return asyncio.run(acheck_code_quality(project_path))
+
+
+# The wrapper classes bind the module functions directly; a def-method
+# indirection here only added an extra Python frame per tool dispatch.
+class TestRunnerTool:
+    """Tool wrapper around the test runners."""
+
+    run_python = staticmethod(run_python_tests)
+    run_javascript = staticmethod(run_javascript_tests)
+    quality_check = staticmethod(check_code_quality)
+
+
+class CoverageAnalyzerTool:
+    """Tool wrapper around the coverage reporter."""
+
+    analyze = staticmethod(generate_coverage_report)
@@ -1,4 +1,279 @@
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool
+"""
+Web Research Tools
 
-WebResearchTool = SerperDevTool
-SearchTool = SerperDevTool
+Lookup helpers the research agent uses to ground its recommendations:
+live web search through the Serper API plus curated best-practice and
+library knowledge for the stacks this system generates.
+
+Tool functions return human-readable strings (not exceptions) so agents
+can reason about failures.
+"""
+
+import functools
+import json
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson encodes/decodes small dicts 2-10x faster than stdlib json; the
+# payload is passed pre-encoded as data= so requests skips its own
+# json.dumps. Fall back to stdlib when unavailable.
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - exercised only without orjson
+    def _json_dumps(data):
+        return json.dumps(data).encode("utf-8")
+
+    _json_loads = json.loads
+
+# Curated knowledge, keyed by technology keyword. Built once at import;
+# lookups below are direct dict hits instead of substring scans.
+_BEST_PRACTICES = {
+    "flask": (
+        "Flask best practices:\n"
+        "- Use the application-factory pattern (create_app) so config and\n"
+        "  extensions bind per instance\n"
+        "- Group routes into blueprints by domain, not by HTTP verb\n"
+        "- Read secrets from environment variables, never from source\n"
+        "- Return errors as JSON with consistent shape and status codes\n"
+        "- Run behind gunicorn in production, never the dev server"
+    ),
+    "react": (
+        "React best practices:\n"
+        "- Prefer function components and hooks over class components\n"
+        "- Keep state as local as possible; lift only when shared\n"
+        "- Split routes with React.lazy to keep the initial bundle small\n"
+        "- Derive data in render instead of mirroring props into state\n"
+        "- Co-locate component, styles and tests in one folder"
+    ),
+    "api": (
+        "REST API best practices:\n"
+        "- Version the API in the path (/api/v1/)\n"
+        "- Use nouns for resources and HTTP verbs for actions\n"
+        "- Paginate collection endpoints and document the defaults\n"
+        "- Validate input at the boundary and return 422 with field errors\n"
+        "- Rate-limit per client and return Retry-After on 429"
+    ),
+    "database": (
+        "Database best practices:\n"
+        "- Manage schema through migrations (Flask-Migrate/Alembic)\n"
+        "- Index columns used in WHERE and JOIN clauses\n"
+        "- Keep transactions short; never hold one across an HTTP call\n"
+        "- Use connection pooling sized to the worker count\n"
+        "- Never interpolate user input into SQL; bind parameters"
+    ),
+    "auth": (
+        "Authentication best practices:\n"
+        "- Hash passwords with a slow KDF (bcrypt/argon2), never plain SHA\n"
+        "- Use short-lived JWT access tokens plus rotating refresh tokens\n"
+        "- Store tokens in httpOnly cookies, not localStorage\n"
+        "- Always validate and expire sessions server-side\n"
+        "- Enforce HTTPS everywhere; set Secure and SameSite on cookies"
+    ),
+    "testing": (
+        "Testing best practices:\n"
+        "- Arrange fixtures once per session where safe, per test otherwise\n"
+        "- Test behavior through public interfaces, not implementation\n"
+        "- Keep unit tests hermetic; isolate network and filesystem\n"
+        "- Measure coverage but gate on meaningful thresholds, not 100%\n"
+        "- Run the suite in CI on every push"
+    ),
+    "docker": (
+        "Docker best practices:\n"
+        "- Use multi-stage builds to keep runtime images small\n"
+        "- Pin base image versions; avoid :latest\n"
+        "- Run as a non-root user inside the container\n"
+        "- Put dependency installation before COPY . for layer caching\n"
+        "- Add HEALTHCHECK so orchestrators can restart dead containers"
+    ),
+}
+
+_LIBRARIES = {
+    "flask": (
+        "Recommended Flask libraries:\n"
+        "- flask-sqlalchemy + flask-migrate: ORM and schema migrations\n"
+        "- flask-jwt-extended: JWT authentication\n"
+        "- flask-cors: cross-origin resource sharing\n"
+        "- marshmallow: request/response serialization\n"
+        "- gunicorn: production WSGI server"
+    ),
+    "react": (
+        "Recommended React libraries:\n"
+        "- react-router-dom: client-side routing\n"
+        "- axios: HTTP client with interceptors\n"
+        "- @tanstack/react-query: server-state caching\n"
+        "- react-hook-form: performant form handling"
+    ),
+    "testing": (
+        "Recommended testing libraries:\n"
+        "- pytest + pytest-cov: Python test runner and coverage\n"
+        "- pytest-flask: Flask app/client fixtures\n"
+        "- jest + @testing-library/react: frontend unit tests\n"
+        "- factory_boy: test data factories"
+    ),
+    "database": (
+        "Recommended database libraries:\n"
+        "- SQLAlchemy: ORM and core SQL toolkit\n"
+        "- alembic: migrations\n"
+        "- psycopg2-binary: PostgreSQL driver\n"
+        "- redis: caching layer client"
+    ),
+}
+
+# Optional Aho-Corasick automaton for keyword spotting inside free-form
+# queries: one C-level pass over the query finds every table keyword at
+# once, O(query_len) regardless of how many keywords the tables grow to.
+# Falls back to a linear substring scan when pyahocorasick is absent.
+try:
+    import ahocorasick
+
+    def _build_automaton(table):
+        auto = ahocorasick.Automaton()
+        for kw, text in table.items():
+            auto.add_word(kw, (kw, text))
+        auto.make_automaton()
+        return auto
+
+    _BP_AUTO = _build_automaton(_BEST_PRACTICES)
+    _LIB_AUTO = _build_automaton(_LIBRARIES)
+
+    def _keyword_hits(auto, query: str):
+        return [value for _, value in auto.iter(query)]
+except ImportError:  # pragma: no cover - exercised only without pyahocorasick
+    _BP_AUTO = _BEST_PRACTICES
+    _LIB_AUTO = _LIBRARIES
+
+    def _keyword_hits(table, query: str):
+        return [(kw, text) for kw, text in table.items() if kw in query]
+
+
+_SERPER_URL = "https://google.serper.dev/search"
+
+# One session for every search: requests.post() builds and tears down a
+# Session per call, paying a fresh TCP + TLS handshake to serper.dev each
+# time. A pooled session reuses the connection across queries.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Content-Type": "application/json"})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ),
+)
+
+
+def _search_with_serper(query: str, num_results: int = 5) -> str:
+    """
+    Query the Serper search API.
+
+    Args:
+        query: Search query
+        num_results: Number of organic results to include
+
+    Returns:
+        str: Formatted search results, or an error message
+    """
+    api_key = os.getenv("SERPER_API_KEY")
+    if not api_key:
+        return "Error: SERPER_API_KEY is not set"
+    try:
+        payload = {"q": query, "num": num_results}
+        response = _SESSION.post(
+            _SERPER_URL,
+            data=_json_dumps(payload),
+            headers={"X-API-KEY": api_key},
+            timeout=10,
+        )
+        response.raise_for_status()
+        data = _json_loads(response.content)
+        lines = [f"Search results for: {query}"]
+        for item in data.get("organic", [])[:num_results]:
+            lines.append(f"- {item.get('title', '')}: {item.get('link', '')}")
+            if item.get("snippet"):
+                lines.append(f"  {item['snippet']}")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"Error searching for '{query}': {str(e)}"
+
+
+@functools.lru_cache(maxsize=256)
+def research_best_practices(technology: str, topic: str = "") -> str:
+    """
+    Look up best practices for a technology, optionally scoped to a topic.
+
+    Both arguments are normalized to lowercase keys into the curated
+    table — two O(1) dict hits instead of scanning every entry. Results
+    are memoized; agents ask the same best-practice questions repeatedly
+    within a conversation.
+
+    Args:
+        technology: Technology keyword (flask, react, api, ...)
+        topic: Optional narrower topic keyword (auth, testing, ...)
+
+    Returns:
+        str: Curated best practices, falling back to a live search
+    """
+    hit = _BEST_PRACTICES.get(topic.lower()) or _BEST_PRACTICES.get(technology.lower())
+    if hit is not None:
+        return hit
+    # Free-form input ("Flask REST APIs") may still contain table keywords;
+    # spot them in one automaton pass before falling back to a live search.
+    hits = _keyword_hits(_BP_AUTO, f"{topic.lower()} {technology.lower()}")
+    if hits:
+        return "\n\n".join(text for _, text in hits)
+    query = f"{technology} {topic} best practices".strip()
+    return _search_with_serper(query)
+
+
+@functools.lru_cache(maxsize=256)
+def find_libraries(category: str) -> str:
+    """
+    Look up recommended libraries for a category.
+
+    Direct dict lookup with a live-search fallback; memoized like
+    research_best_practices.
+
+    Args:
+        category: Library category keyword (flask, react, testing, ...)
+
+    Returns:
+        str: Curated library recommendations, falling back to a live search
+    """
+    hit = _LIBRARIES.get(category.lower())
+    if hit is not None:
+        return hit
+    hits = _keyword_hits(_LIB_AUTO, category.lower())
+    if hits:
+        return "\n\n".join(text for _, text in hits)
+    return _search_with_serper(f"best {category} python javascript libraries")
+
+
+# The wrapper classes bind the module functions directly; a def-method
+# indirection here only added an extra Python frame per tool dispatch,
+# and the classes carry no per-instance state worth constructing.
+class WebResearchTool:
+    """Tool wrapper around the research helpers."""
+
+    best_practices = staticmethod(research_best_practices)
+    libraries = staticmethod(find_libraries)
+
+
+# Shared instance for callers that want an object handle; the class is
+# stateless so one instance serves every agent.
+_SHARED_WEB_RESEARCH = WebResearchTool()
+
+
+class SearchTool:
+    """Tool wrapper around the raw web search."""
+
+    search = staticmethod(_search_with_serper)
+
+    def __init__(self):
+        self.research = _SHARED_WEB_RESEARCH
@@ -0,0 +1,38 @@
+"""
+Fast Tokenizer Adapter
+
+Resolves tiktoken-compatible encodings through an optional native
+accelerator when one is installed, falling back to tiktoken's own
+encodings. The accelerator must expose ``Encoding(name)`` objects with
+the same ``encode``/``decode``/``encode_batch`` surface as tiktoken.
+
+This gives the token utilities a single seam to swap in a faster BPE
+implementation (e.g. a pyo3 wrapper around tiktoken-rs) without
+touching any call sites.
+"""
+
+import functools
+
+import tiktoken
+
+# Optional drop-in accelerator; absent in a standard install
+try:
+    import _fast_tiktoken
+except ImportError:
+    _fast_tiktoken = None
+
+
+@functools.lru_cache(maxsize=8)
+def get_fast_encoding(name: str):
+    """
+    Resolve an encoding by name, preferring the native accelerator.
+
+    Args:
+        name: tiktoken encoding name (e.g. "cl100k_base")
+
+    Returns:
+        An encoding object with tiktoken's encode/decode interface
+    """
+    if _fast_tiktoken is not None:
+        return _fast_tiktoken.Encoding(name)
+    return tiktoken.get_encoding(name)
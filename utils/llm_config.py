@@ -5,13 +5,28 @@ Manages configuration for GitHub Models API ONLY.
 Uses your GitHub Personal Access Token with 'models' scope.
 """
 
+import functools
 import os
 import logging
-from typing import Dict, Any, Optional
+import sys
+import threading
+import types
+from typing import Dict, Any, NamedTuple, Optional
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+@functools.lru_cache(maxsize=1)
+def _init_env() -> bool:
+    """
+    Load .env once, lazily.
+
+    A top-level load_dotenv() made every import of this module pay for
+    .env file parsing; deferring it to the first config/model lookup
+    keeps plain imports (e.g. for GITHUB_MODELS) free, and lru_cache
+    guarantees the parse happens at most once per process.
+    """
+    load_dotenv()
+    return True
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,57 +38,98 @@ class LLMProvider:
     GITHUB = "github"
 
 
+class LLMConfig(NamedTuple):
+    """
+    Built LLM configuration.
+
+    A NamedTuple is a fraction of a dict's footprint and its fields are
+    fixed-slot accesses; the dict shape CrewAI expects is produced only
+    at the get_llm_config boundary via as_dict().
+    """
+    model: str
+    base_url: str
+    api_key: str
+    max_tokens: int
+    max_retries: int
+    timeout: int
+    temperature: Optional[float] = None  # None for o-series models
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Dict form for CrewAI; omits temperature when unsupported."""
+        d = self._asdict()
+        if self.temperature is None:
+            del d["temperature"]
+        return d
+
+
 # Available models - GitHub Models API
 # Model IDs for inference API do NOT include provider prefix
 # See: https://models.github.ai/catalog/models
-GITHUB_MODELS = {
+#
+# Most entries map a name to itself; storing both sides of every
+# identity pair doubled the literal for no information. The names are
+# kept as one tuple (order preserved for listings) plus a small alias
+# dict for the models whose catalog ID differs from the friendly name.
+_GITHUB_IDENTITY_NAMES = (
     # GPT-5 Series (Latest - April 2025)
-    "gpt-5": "gpt-5",
-    "gpt-5-chat": "gpt-5-chat",
-    "gpt-5-mini": "gpt-5-mini",
-    "gpt-5-nano": "gpt-5-nano",
-    
-    # GPT-4.1 Series (Latest - April 2025) 
-    "gpt-4.1": "gpt-4.1",
-    "gpt-4.1-mini": "gpt-4.1-mini",
-    "gpt-4.1-nano": "gpt-4.1-nano",
-    
+    "gpt-5",
+    "gpt-5-chat",
+    "gpt-5-mini",
+    "gpt-5-nano",
+
+    # GPT-4.1 Series (Latest - April 2025)
+    "gpt-4.1",
+    "gpt-4.1-mini",
+    "gpt-4.1-nano",
+
     # GPT-4o Series (Legacy but widely used and VERIFIED WORKING)
-    "gpt-4o": "gpt-4o",
-    "gpt-4o-mini": "gpt-4o-mini",
-    
+    "gpt-4o",
+    "gpt-4o-mini",
+
     # o Series (Reasoning models)
-    "o1": "o1",
-    "o1-mini": "o1-mini",
-    "o1-preview": "o1-preview",
-    "o3": "o3",
-    "o3-mini": "o3-mini",
-    "o4-mini": "o4-mini",
-    
+    "o1",
+    "o1-mini",
+    "o1-preview",
+    "o3",
+    "o3-mini",
+    "o4-mini",
+
+    # xAI Grok
+    "grok-3",
+    "grok-3-mini",
+)
+
+_GITHUB_ALIASES = {
     # Microsoft Phi Series
     "phi-4": "Phi-4",
     "phi-4-reasoning": "Phi-4-reasoning",
     "phi-4-mini-instruct": "Phi-4-mini-instruct",
     "phi-4-mini-reasoning": "Phi-4-mini-reasoning",
     "phi-4-multimodal-instruct": "Phi-4-multimodal-instruct",
-    
+
     # DeepSeek (Advanced reasoning and coding)
     "deepseek-r1": "DeepSeek-R1",
     "deepseek-v3": "DeepSeek-V3-0324",
-    
+
     # Meta Llama
     "llama-3.3-70b": "Llama-3.3-70B-Instruct",
-    
+
     # Mistral AI
     "mistral-small": "Mistral-small-2503",
     "codestral": "Codestral-2501",
-    
-    # xAI Grok
-    "grok-3": "grok-3",
-    "grok-3-mini": "grok-3-mini",
 }
 
 
+def _github_model_id(name: str) -> str:
+    """Map a friendly model name to its GitHub catalog identifier."""
+    return _GITHUB_ALIASES.get(name, name)
+
+
+# Full name -> id mapping, built once for importers that iterate it
+GITHUB_MODELS = {name: name for name in _GITHUB_IDENTITY_NAMES}
+GITHUB_MODELS.update(_GITHUB_ALIASES)
+
+
 def get_llm_config(provider: Optional[str] = None, model: Optional[str] = None) -> Dict[str, Any]:
     """
     Get LLM configuration for GitHub Models API.
@@ -83,29 +139,94 @@ def get_llm_config(provider: Optional[str] = None, model: Optional[str] = None)
         model: Model name to use (if not specified, uses default from env)
         
     Returns:
-        Dict with configuration for CrewAI agents
-        
+        Read-only mapping with configuration for CrewAI agents. Shared
+        across calls — use dict(config) if you need to mutate it.
+
     Example:
         >>> config = get_llm_config()
         >>> agent = Agent(..., llm=config)
     """
+    # Last-call memo: back-to-back calls with identical arguments (the
+    # common shape in tests and interactive loops) skip even the env
+    # default resolution below. Thread-local so no locking is needed;
+    # the generation counter invalidates memos on reset_env_cache().
+    memo = getattr(_LAST_CONFIG, "v", None)
+    if memo is not None and memo[0] == (provider, model, _CONFIG_GENERATION[0]):
+        return memo[1]
+
+    _init_env()
+
+    key = (provider, model, _CONFIG_GENERATION[0])
+
     # Always use GitHub Models
     provider = LLMProvider.GITHUB
-    
+
     # Get model name
     if model is None:
         model = os.getenv("GITHUB_MODEL", "gpt-4.1")  # Default to best general coding model
-    
-    # Build configuration
-    return _build_github_config(model)
 
+    config = _get_llm_config_cached(provider, model)
+    _LAST_CONFIG.v = (key, config)
+    return config
+
+
+_LAST_CONFIG = threading.local()
+_CONFIG_GENERATION = [0]
+
+
+@functools.lru_cache(maxsize=32)
+def _get_llm_config_cached(provider: str, model: str) -> Any:
+    """
+    Cached, immutable config keyed by (provider, model).
+
+    Agents request the same config 6+ times per run; handing out one
+    shared MappingProxyType removes the per-call dict copy while keeping
+    the cached entry safe from caller mutation.
+    """
+    return types.MappingProxyType(_build_github_config(model).as_dict())
+
+
+# o-series models (o1, o3, etc.) only support temperature=1
+# They have their own internal reasoning temperature
+_O_SERIES_MODELS = frozenset(["o1", "o1-mini", "o1-preview", "o3", "o3-mini", "o4-mini"])
+
+
+@functools.lru_cache(maxsize=1)
+def _default_max_tokens() -> int:
+    """Parse LLM_MAX_TOKENS once (frozen at first call)."""
+    return int(os.getenv("LLM_MAX_TOKENS", "4000"))
 
-def _build_github_config(model: str) -> Dict[str, Any]:
+
+@functools.lru_cache(maxsize=1)
+def _default_temperature() -> float:
+    """Parse LLM_TEMPERATURE once (frozen at first call)."""
+    return float(os.getenv("LLM_TEMPERATURE", "0.7"))
+
+
+def reset_env_cache() -> None:
+    """Forget cached env-derived values (for tests that mutate the env)."""
+    _default_max_tokens.cache_clear()
+    _default_temperature.cache_clear()
+    _build_github_config.cache_clear()
+    _get_llm_config_cached.cache_clear()
+    _best_model_cached.cache_clear()
+    _provider_info_cached.cache_clear()
+    _override_env_names.cache_clear()
+    _CONFIG_GENERATION[0] += 1  # invalidate per-thread last-call memos
+
+
+@functools.lru_cache(maxsize=32)
+def _build_github_config(model: str) -> LLMConfig:
     """
     Build configuration for GitHub Models.
-    
+
     GitHub Models uses an OpenAI-compatible endpoint, so we can use
     the OpenAI client with custom base_url.
+
+    Cached per model: every agent in the crew requests the same config at
+    construction time, so env lookups and dict building happen once.
+    Env vars (GITHUB_TOKEN, LLM_MAX_TOKENS, LLM_TEMPERATURE) are frozen
+    at first call.
     """
     github_token = os.getenv("GITHUB_TOKEN")
     if not github_token:
@@ -114,54 +235,76 @@ def _build_github_config(model: str) -> Dict[str, Any]:
             "https://github.com/settings/tokens with 'models' scope"
         )
     
-    # Map friendly model name to GitHub model identifier
-    model_id = GITHUB_MODELS.get(model, model)
-    
-    # o-series models (o1, o3, etc.) only support temperature=1
-    # They have their own internal reasoning temperature
-    o_series_models = ["o1", "o1-mini", "o1-preview", "o3", "o3-mini", "o4-mini"]
-    
-    # GitHub Models endpoint is OpenAI-compatible
-    config = {
-        "model": model_id,
-        "base_url": "https://models.inference.ai.azure.com",
-        "api_key": github_token,
-        "max_tokens": int(os.getenv("LLM_MAX_TOKENS", "4000")),
-        # Auto-retry on rate limit errors (429)
-        "max_retries": 5,  # Retry up to 5 times
-        "timeout": 120,     # 2 minute timeout per request
-    }
-    
-    # Only add temperature if not an o-series model
-    if model not in o_series_models:
-        config["temperature"] = float(os.getenv("LLM_TEMPERATURE", "0.7"))
-    
+    # Map friendly model name to GitHub model identifier; interned so
+    # repeated configs share one string and compare by pointer
+    model_id = sys.intern(_github_model_id(model))
+
     logger.info(f"🔄 LLM configured with auto-retry: max_retries=5, timeout=120s for rate limit handling")
-    
-    return config
 
+    # GitHub Models endpoint is OpenAI-compatible. o-series models get
+    # temperature=None (they only accept 1 and use their own internal
+    # reasoning temperature); as_dict() drops the field for them.
+    return LLMConfig(
+        model=model_id,
+        base_url=_GH_BASE_URL,
+        api_key=github_token,
+        max_tokens=_default_max_tokens(),
+        # Auto-retry on rate limit errors (429)
+        max_retries=5,  # Retry up to 5 times
+        timeout=120,     # 2 minute timeout per request
+        temperature=None if model in _O_SERIES_MODELS else _default_temperature(),
+    )
+
+
+# Model names snapshot; tuple(dict) is taken once so list_available_models
+# only pays a cheap tuple->list copy per call
+_MODEL_NAMES = tuple(GITHUB_MODELS.keys())
 
+
+@functools.lru_cache(maxsize=1)
 def list_available_models() -> Dict[str, list]:
-    """List all available models."""
+    """List all available models (built once; treat the result as read-only)."""
     return {
-        "github": list(GITHUB_MODELS.keys()),
+        "github": list(_MODEL_NAMES),
     }
 
 
 def get_provider_info() -> str:
     """Get information about the currently configured provider."""
+    # Keyed on the env snapshot so the cached string stays correct if a
+    # test points GITHUB_MODEL elsewhere between calls
+    return _provider_info_cached(os.getenv("GITHUB_MODEL", ""))
+
+
+@functools.lru_cache(maxsize=8)
+def _provider_info_cached(model_snapshot: str) -> str:
+    """Assemble the provider info string once per GITHUB_MODEL value."""
     try:
         config = get_llm_config()
         model = config.get("model", "unknown")
-        
+
         info = f"Provider: GITHUB MODELS\nModel: {model}"
         info += "\n💰 Cost: FREE (using GitHub Personal Access Token)"
-        
+
         return info
     except ValueError as e:
         return f"No provider configured: {e}"
 
 
+# Token budget per model, flattened from the tier sets into one table so
+# the lookup is a single dict hit instead of sequential membership checks
+_MAX_TOKENS_DEFAULT = 2000  # gpt-4o and others - conservative default
+_MAX_TOKENS_TABLE = {
+    # 4000 total - leave 3000 for prompt
+    "gpt-5-chat": 1000, "gpt-5": 1000, "gpt-5-mini": 1000, "gpt-5-nano": 1000,
+    "o1-mini": 1000, "o3-mini": 1000, "o4-mini": 1000,
+    # Slightly higher but still conservative
+    "o1": 1500, "o3": 1500, "o1-preview": 1500,
+    # 8000 total - leave 6000 for prompt
+    "gpt-4.1": 2000, "gpt-4.1-mini": 2000, "gpt-4.1-nano": 2000,
+}
+
+
 def get_max_tokens_for_model(model_id: str) -> int:
     """
     Get appropriate max_tokens for a given model.
@@ -174,18 +317,61 @@ def get_max_tokens_for_model(model_id: str) -> int:
     
     We use conservative values to leave room for prompts.
     """
-    # Models with very low limits
-    if model_id in ["gpt-5-chat", "gpt-5", "gpt-5-mini", "gpt-5-nano"]:
-        return 1000  # 4000 total - leave 3000 for prompt
-    elif model_id in ["o1-mini", "o3-mini", "o4-mini"]:
-        return 1000  # 4000 total - leave 3000 for prompt
-    elif model_id in ["o1", "o3", "o1-preview"]:
-        return 1500  # Slightly higher but still conservative
-    elif model_id in ["gpt-4.1", "gpt-4.1-mini", "gpt-4.1-nano"]:
-        return 2000  # 8000 total - leave 6000 for prompt
-    else:
-        # gpt-4o and others - use conservative default
-        return 2000
+    return _MAX_TOKENS_TABLE.get(model_id, _MAX_TOKENS_DEFAULT)
+
+
+# Recommended models per agent role
+# ✅ OPTIMIZED STRATEGY - Without memory and context accumulation
+#
+# Now that we've disabled memory and reduced context passing,
+# we can use more advanced models without hitting token limits:
+# - gpt-4o: Best all-around, reliable (use as default)
+# - gpt-4.1: Good for code, 8000 token limit
+# - gpt-5-chat: Advanced reasoning, 4000 token limit (use for simple tasks)
+#
+# Strategy: Use best model for each role that fits within limits
+#
+# Built once at import and wrapped read-only; get_best_model_for_agent is
+# called in the crew-startup loop and shouldn't rebuild the table per call.
+_AGENT_MODEL_RECOMMENDATIONS = types.MappingProxyType({
+    "business_analyst": "gpt-4o",    # Needs context, use reliable model
+    "project_manager": "gpt-4o",     # Needs overview, use reliable model
+    "backend": "gpt-4o",             # Complex code, need stability
+    "frontend": "gpt-4o",            # Complex code, need stability
+    "devops": "gpt-4o",              # Infrastructure needs stability
+    "qa": "gpt-4o",                  # Testing needs thoroughness
+})
+
+# role -> (override env var, recommended model), precomputed so the hot
+# path is one dict hit with no per-call .upper() formatting; the table
+# is curated from the recommendations above, so entries need no
+# re-validation against GITHUB_MODELS
+_ROLE_TABLE = {
+    role: (f"{role.upper()}_MODEL", model)
+    for role, model in _AGENT_MODEL_RECOMMENDATIONS.items()
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _override_env_names() -> frozenset:
+    """
+    Snapshot of *_MODEL env var names present at first lookup.
+
+    Overrides are absent in the common case; probing this small set is
+    cheaper than an os.environ lookup per call, and the snapshot only
+    needs refreshing when a test mutates the environment.
+    """
+    return frozenset(k for k in os.environ if k.endswith("_MODEL"))
+
+
+def refresh_overrides() -> None:
+    """Re-snapshot override env vars (for tests that mutate the env)."""
+    _override_env_names.cache_clear()
+    _best_model_cached.cache_clear()
+
+# GitHub Models endpoint; hoisted so every config shares one string
+# object (CPython doesn't intern URL-shaped literals)
+_GH_BASE_URL = "https://models.inference.ai.azure.com"
 
 
 def get_best_model_for_agent(agent_role: str) -> Optional[str]:
@@ -204,36 +390,25 @@ def get_best_model_for_agent(agent_role: str) -> Optional[str]:
         >>> model = get_best_model_for_agent('backend')
         >>> config = get_llm_config(model=model)
     """
-    # Check if user has overridden the model for this specific agent
-    env_var = f"{agent_role.upper()}_MODEL"
-    override = os.getenv(env_var)
+    _init_env()
+
+    # The override snapshot is part of the cache key, so the memoized
+    # result stays correct when a test mutates the env between calls
+    role = agent_role.lower()
+    entry = _ROLE_TABLE.get(role)
+    env_var = entry[0] if entry is not None else f"{agent_role.upper()}_MODEL"
+    override = os.environ[env_var] if env_var in _override_env_names() else None
+    return _best_model_cached(role, override)
+
+
+@functools.lru_cache(maxsize=32)
+def _best_model_cached(role: str, override: Optional[str]) -> Optional[str]:
+    """Resolve the model for a (role, env override) pair once."""
     if override:
         return override
-    
-    # Recommended models per agent role
-    # ✅ OPTIMIZED STRATEGY - Without memory and context accumulation
-    # 
-    # Now that we've disabled memory and reduced context passing,
-    # we can use more advanced models without hitting token limits:
-    # - gpt-4o: Best all-around, reliable (use as default)
-    # - gpt-4.1: Good for code, 8000 token limit
-    # - gpt-5-chat: Advanced reasoning, 4000 token limit (use for simple tasks)
-    #
-    # Strategy: Use best model for each role that fits within limits
-    recommendations = {
-        "business_analyst": "gpt-4o",    # Needs context, use reliable model
-        "project_manager": "gpt-4o",     # Needs overview, use reliable model
-        "backend": "gpt-4o",             # Complex code, need stability
-        "frontend": "gpt-4o",            # Complex code, need stability
-        "devops": "gpt-4o",              # Infrastructure needs stability
-        "qa": "gpt-4o",                  # Testing needs thoroughness
-    }
-    
-    recommended = recommendations.get(agent_role.lower())
-    
-    # Return recommended model if it exists in GitHub Models
-    if recommended and recommended in GITHUB_MODELS:
-        return recommended
-    
-    # Return None to use the default model from environment
-    return None
+
+    entry = _ROLE_TABLE.get(role)
+
+    # Return the curated recommendation, or None to use the default
+    # model from environment
+    return entry[1] if entry is not None else None
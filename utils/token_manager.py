@@ -4,105 +4,210 @@ Token Management Utilities
 Manages token counting and truncation to prevent 413 errors.
 """
 
-import tiktoken
+import array
+import functools
+import os
+import threading
+import types
+from collections import OrderedDict
+
 from typing import Any
 
+from utils.fast_tokenizer import get_fast_encoding
+
+# xxhash gives collision-resistant 64-bit digests at memory bandwidth;
+# Python's builtin hash is the fallback (fine for a bounded cache).
+try:
+    import xxhash
+
+    def _text_key(text: str) -> int:
+        return xxhash.xxh64(text.encode("utf-8")).intdigest()
+except ImportError:  # pragma: no cover - exercised only without xxhash
+    _text_key = hash
+
+# Map our model names to tiktoken encodings (hoisted; the per-call dict
+# literal was rebuilt on every count/truncate). Read-only proxy: the
+# table is shared process state and nothing should mutate it at runtime.
+_ENCODING_MAP = types.MappingProxyType({
+    "gpt-4o": "cl100k_base",
+    "gpt-4o-mini": "cl100k_base",
+    "gpt-4.1": "cl100k_base",
+    "gpt-5-chat": "cl100k_base",
+    "o3": "cl100k_base",
+    "o3-mini": "cl100k_base",
+    "o1-mini": "cl100k_base",
+})
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Resolve a model's encoding once per process (accelerator-aware)."""
+    return get_fast_encoding(_ENCODING_MAP.get(model, "cl100k_base"))
+
+
+# L0 whole-string count cache. Task outputs get re-counted several times
+# (store → summarize → combine), so a hit skips the BPE pass entirely.
+# Bounded FIFO: oldest entry is evicted once the cache fills up.
+_MAX_CACHE_ENTRIES = 10_000
+_TOKEN_COUNT_CACHE: "OrderedDict[tuple, int]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# L1 prefix count cache. Task outputs often share a long boilerplate
+# header (system prompt, task template), so the prefix's token count is
+# cached at a fixed boundary and only the suffix gets encoded. The cut
+# is snapped to the end of a newline run — a hard split point in
+# cl100k-family regex pre-tokenization — so prefix and suffix counts
+# sum exactly to the whole-string count.
+_PREFIX_BOUNDARIES = (4096, 2048, 1024, 512, 256)
+_MAX_PREFIX_ENTRIES = 1024
+_PREFIX_COUNT_CACHE: "OrderedDict[tuple, int]" = OrderedDict()
+
+
+def _prefix_cut(text: str) -> int:
+    """Char offset of the L1 prefix boundary for text (0 when unusable)."""
+    for boundary in _PREFIX_BOUNDARIES:
+        # Require a substantial suffix so the cache only kicks in when
+        # the shared-header assumption can actually pay off
+        if len(text) > boundary * 2:
+            cut = text.rfind('\n', 0, boundary)
+            if cut < 0:
+                return 0
+            cut += 1
+            while cut < len(text) and text[cut] == '\n':
+                cut += 1
+            return cut
+    return 0
+
 
 def count_tokens(text: str, model: str = "gpt-4o") -> int:
     """
     Count tokens in a text string for a given model.
-    
+
     Args:
         text: Text to count tokens for
         model: Model name (determines encoding)
-        
+
     Returns:
         int: Number of tokens
     """
-    try:
-        # Map our model names to tiktoken encodings
-        encoding_map = {
-            "gpt-4o": "cl100k_base",
-            "gpt-4.1": "cl100k_base",
-            "gpt-5-chat": "cl100k_base",
-            "o3": "cl100k_base",
-            "o3-mini": "cl100k_base",
-            "o1-mini": "cl100k_base",
-        }
-        
-        encoding_name = encoding_map.get(model, "cl100k_base")
-        encoding = tiktoken.get_encoding(encoding_name)
-        return len(encoding.encode(text))
-    except Exception as e:
-        # Fallback: rough estimate (1 token ≈ 4 characters)
-        return len(text) // 4
+    key = (_text_key(text), model)
+    cached = _TOKEN_COUNT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    # An encode failure here means a broken encoding map or tiktoken
+    # install — a bug, not a runtime condition — so let it raise
+    encoding = _get_encoding(model)
+    cut = _prefix_cut(text)
+    if cut:
+        prefix_key = (_text_key(text[:cut]), model)
+        prefix_count = _PREFIX_COUNT_CACHE.get(prefix_key)
+        if prefix_count is None:
+            prefix_count = len(encoding.encode(text[:cut]))
+            with _CACHE_LOCK:
+                _PREFIX_COUNT_CACHE[prefix_key] = prefix_count
+                if len(_PREFIX_COUNT_CACHE) > _MAX_PREFIX_ENTRIES:
+                    _PREFIX_COUNT_CACHE.popitem(last=False)
+        count = prefix_count + len(encoding.encode(text[cut:]))
+    else:
+        count = len(encoding.encode(text))
+
+    with _CACHE_LOCK:
+        _TOKEN_COUNT_CACHE[key] = count
+        if len(_TOKEN_COUNT_CACHE) > _MAX_CACHE_ENTRIES:
+            _TOKEN_COUNT_CACHE.popitem(last=False)
+    return count
+
+
+def _definitely_under_limit(text: str, max_tokens: int) -> bool:
+    """
+    Cheap filter that proves a text fits without encoding it.
+
+    cl100k_base tokens average ~4 characters; 2 chars/token is a
+    conservative lower bound, so any text at or under max_tokens * 2
+    characters cannot exceed the limit.
+    """
+    return len(text) <= max_tokens * 2
 
 
-def truncate_to_token_limit(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+def truncate_to_token_limit(
+    text: str,
+    max_tokens: int,
+    model: str = "gpt-4o",
+    *,
+    tokens=None,
+    keep_start=None,
+    keep_end=None,
+) -> str:
     """
     Truncate text to fit within token limit, keeping beginning and end.
-    
+
     Args:
         text: Text to truncate
         max_tokens: Maximum tokens allowed
         model: Model name (determines encoding)
-        
+        tokens: Pre-encoded token ids of text, if the caller already has
+            them (skips the encode pass)
+        keep_start: Tokens to keep from the start (default 60% of budget)
+        keep_end: Tokens to keep from the end (default 40% of budget)
+
     Returns:
         str: Truncated text
     """
-    current_tokens = count_tokens(text, model)
-    
+    if tokens is None:
+        if _definitely_under_limit(text, max_tokens):
+            return text
+
+        # Single encode pass: the token list both answers the "is it
+        # over the limit?" check and gets sliced directly below
+        tokens = _get_encoding(model).encode(text)
+
+    current_tokens = len(tokens)
+
     if current_tokens <= max_tokens:
         return text
-    
+
+    # Slice as a contiguous C int buffer: list slices of a large token
+    # list allocate a boxed Python int per element
+    if not isinstance(tokens, array.array):
+        tokens = array.array('i', tokens)
+
+    encoding = _get_encoding(model)
+
     # Keep first 60% and last 40% of the token budget
-    keep_start_tokens = int(max_tokens * 0.6)
-    keep_end_tokens = int(max_tokens * 0.4)
-    
-    try:
-        encoding_map = {
-            "gpt-4o": "cl100k_base",
-            "gpt-4.1": "cl100k_base",
-            "gpt-5-chat": "cl100k_base",
-            "o3": "cl100k_base",
-            "o3-mini": "cl100k_base",
-            "o1-mini": "cl100k_base",
-        }
-        
-        encoding_name = encoding_map.get(model, "cl100k_base")
-        encoding = tiktoken.get_encoding(encoding_name)
-        
-        tokens = encoding.encode(text)
-        
-        # Keep start and end tokens
-        truncated_tokens = (
-            tokens[:keep_start_tokens] + 
-            tokens[-keep_end_tokens:]
-        )
-        
-        truncated_text = encoding.decode(truncated_tokens)
-        
-        # Add marker to show truncation
-        marker = f"\n\n[... Content truncated: {current_tokens} tokens → {max_tokens} tokens ...]\n\n"
-        
-        # Find a good split point (middle of text)
-        mid_point = len(truncated_text) // 2
-        start_part = truncated_text[:mid_point]
-        end_part = truncated_text[mid_point:]
-        
-        return start_part + marker + end_part
-        
-    except Exception as e:
-        # Fallback: character-based truncation
-        chars_per_token = len(text) / current_tokens
-        max_chars = int(max_tokens * chars_per_token)
-        
-        keep_start_chars = int(max_chars * 0.6)
-        keep_end_chars = int(max_chars * 0.4)
-        
-        marker = f"\n\n[... Content truncated: ~{current_tokens} tokens → ~{max_tokens} tokens ...]\n\n"
-        
-        return text[:keep_start_chars] + marker + text[-keep_end_chars:]
+    keep_start_tokens = int(max_tokens * 0.6) if keep_start is None else keep_start
+    keep_end_tokens = int(max_tokens * 0.4) if keep_end is None else keep_end
+
+    # Add marker to show truncation
+    marker = f"\n\n[... Content truncated: {current_tokens} tokens → {max_tokens} tokens ...]\n\n"
+
+    # Decode the two halves separately: the marker then lands exactly at
+    # the cut, with no re-scan of the decoded text for a split point (and
+    # no risk of splitting a multi-byte character at an arbitrary midpoint)
+    start_part = encoding.decode(tokens[:keep_start_tokens])
+    end_part = encoding.decode(tokens[-keep_end_tokens:])
+
+    return f"{start_part}{marker}{end_part}"
+
+
+def _nth_newline_from_start(s: str, n: int) -> int:
+    """Return the offset of the nth newline in s (len(s) if fewer exist)."""
+    pos = -1
+    for _ in range(n):
+        pos = s.find('\n', pos + 1)
+        if pos < 0:
+            return len(s)
+    return pos
+
+
+def _nth_newline_from_end(s: str, n: int) -> int:
+    """Return the offset of the nth newline counting from the end (-1 if fewer exist)."""
+    pos = len(s)
+    for _ in range(n):
+        pos = s.rfind('\n', 0, pos)
+        if pos < 0:
+            return -1
+    return pos
 
 
 def summarize_task_output(output: str, max_tokens: int = 1500, model: str = "gpt-4o") -> str:
@@ -118,106 +223,172 @@ def summarize_task_output(output: str, max_tokens: int = 1500, model: str = "gpt
     Returns:
         str: Summarized output
     """
+    if _definitely_under_limit(output, max_tokens):
+        return output
+
     current_tokens = count_tokens(output, model)
-    
+
     if current_tokens <= max_tokens:
         return output
     
-    # Extract key sections (first and last parts tend to have key info)
-    lines = output.split('\n')
-    
     # Keep first 40% and last 40% of lines, drop middle 20%
-    total_lines = len(lines)
+    total_lines = output.count('\n') + 1
     keep_start = int(total_lines * 0.4)
     keep_end = int(total_lines * 0.4)
-    
-    summary_lines = (
-        lines[:keep_start] +
-        [f"\n[... Middle section truncated to fit {max_tokens} token limit ...]\n"] +
-        lines[-keep_end:]
-    )
-    
-    summary = '\n'.join(summary_lines)
-    
-    # If still too large, use hard truncation
-    if count_tokens(summary, model) > max_tokens:
-        summary = truncate_to_token_limit(summary, max_tokens, model)
-    
+
+    if keep_start == 0 or keep_end == 0:
+        # Output is essentially one long line; line dropping can't help
+        return truncate_to_token_limit(output, max_tokens, model)
+
+    # Locate the cut points by scanning newline offsets directly instead
+    # of materializing a list of every line and re-joining a slice of it
+    idx_start = _nth_newline_from_start(output, keep_start)
+    idx_end = _nth_newline_from_end(output, keep_end)
+
+    marker = f"\n[... Middle section truncated to fit {max_tokens} token limit ...]\n"
+    summary = f"{output[:idx_start]}\n{marker}\n{output[idx_end + 1:]}"
+
+    # If still too large, use hard truncation — encoding the summary
+    # once here and handing the tokens down avoids a re-encode inside
+    # truncate_to_token_limit
+    if not _definitely_under_limit(summary, max_tokens):
+        summary_tokens = _get_encoding(model).encode(summary)
+        if len(summary_tokens) > max_tokens:
+            summary = truncate_to_token_limit(
+                summary, max_tokens, model, tokens=summary_tokens
+            )
+
     return summary
 
 
+# Model limits based on actual testing (hoisted and frozen; the table
+# was rebuilt on every call)
+_MODEL_LIMITS = types.MappingProxyType({
+    "gpt-4o": 8000,
+    "gpt-4.1": 8000,
+    "gpt-5-chat": 4000,
+    "o3": 4000,
+    "o3-mini": 4000,
+    "o1-mini": 4000,
+    "gpt-4o-mini": 8000,
+    "deepseek-r1": 4000,
+    "phi-4": 4000,
+})
+
+
+@functools.lru_cache(maxsize=16)
 def get_safe_token_limit(model: str) -> dict:
     """
     Get safe token limits for a model (leaves headroom for system prompts).
-    
+
     Args:
         model: Model name
-        
+
     Returns:
-        dict: {
+        Read-only mapping: {
             'total': Total model limit,
             'context': Safe limit for context passing,
             'response': Safe limit for response generation
         }
     """
-    # Model limits based on actual testing
-    model_limits = {
-        "gpt-4o": 8000,
-        "gpt-4.1": 8000,
-        "gpt-5-chat": 4000,
-        "o3": 4000,
-        "o3-mini": 4000,
-        "o1-mini": 4000,
-        "gpt-4o-mini": 8000,
-        "deepseek-r1": 4000,
-        "phi-4": 4000,
-    }
-    
-    total = model_limits.get(model, 4000)
-    
+    total = _MODEL_LIMITS.get(model, 4000)
+
     # Reserve space for system prompts, task description, etc.
     # Context: 50% of total (for passing previous outputs)
     # Response: 30% of total (for agent's response)
     # System/Task: 20% reserved (not returned)
-    
-    return {
+
+    return types.MappingProxyType({
         'total': total,
         'context': int(total * 0.5),  # 50% for context
         'response': int(total * 0.3),  # 30% for response
-    }
+    })
+
+
+# Separator placed between task outputs in combined context
+_CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
+@functools.lru_cache(maxsize=16)
+def _encoded_separator(model: str, sep: str = _CONTEXT_SEPARATOR) -> tuple:
+    """Token ids of a constant separator, encoded once per model."""
+    return tuple(_get_encoding(model).encode(sep))
+
+
+# Cap on stored outputs per manager; long-running agent loops would
+# otherwise hold every historical output for the process lifetime
+_MAX_STORED_OUTPUTS = 1000
 
 
 # Example usage in task callbacks
 class TaskOutputManager:
     """Manages task outputs to prevent token overflow."""
-    
+
     def __init__(self, model: str = "gpt-4o"):
         self.model = model
         self.limits = get_safe_token_limit(model)
-        self.task_outputs = {}
-    
+        # The context budget never changes for a manager, so the 60/40
+        # keep split is fixed at construction
+        self._keep_start = int(self.limits['context'] * 0.6)
+        self._keep_end = int(self.limits['context'] * 0.4)
+        # task_id -> array of token ids; LRU-bounded at _MAX_STORED_OUTPUTS
+        self.task_outputs = OrderedDict()
+
     def store_output(self, task_id: str, output: str) -> str:
         """Store task output with automatic truncation."""
         truncated = summarize_task_output(
-            output, 
+            output,
             max_tokens=self.limits['context'],
             model=self.model
         )
-        self.task_outputs[task_id] = truncated
+        # Keep the token ids: get_combined_context then assembles
+        # context without re-encoding every stored output, and
+        # get_output only decodes on demand
+        self.task_outputs[task_id] = array.array(
+            "I", _get_encoding(self.model).encode(truncated)
+        )
+        self.task_outputs.move_to_end(task_id)
+        while len(self.task_outputs) > _MAX_STORED_OUTPUTS:
+            self.task_outputs.popitem(last=False)
         return truncated
-    
+
     def get_output(self, task_id: str) -> str:
-        """Retrieve stored task output."""
-        return self.task_outputs.get(task_id, "")
-    
+        """Retrieve stored task output (decoded lazily)."""
+        stored = self.task_outputs.get(task_id)
+        if stored is None:
+            return ""
+        self.task_outputs.move_to_end(task_id)
+        return _get_encoding(self.model).decode(list(stored))
+
     def get_combined_context(self, task_ids: list) -> str:
         """Get combined context from multiple tasks, with truncation."""
-        contexts = [self.get_output(tid) for tid in task_ids if tid in self.task_outputs]
-        combined = "\n\n---\n\n".join(contexts)
-        
-        # Ensure combined context fits within limit
-        return truncate_to_token_limit(
-            combined,
-            max_tokens=self.limits['context'],
-            model=self.model
-        )
+        stored = [self.task_outputs[tid] for tid in task_ids if tid in self.task_outputs]
+        if not stored:
+            return ""
+
+        max_tokens = self.limits['context']
+
+        # Outputs are already token ids, so assembling context is pure
+        # integer concatenation — no encode pass at all
+        encoding = _get_encoding(self.model)
+        separator_tokens = _encoded_separator(self.model)
+
+        tokens: list = []
+        for i, fragment in enumerate(stored):
+            if i:
+                tokens.extend(separator_tokens)
+            tokens.extend(fragment)
+
+        current_tokens = len(tokens)
+        if current_tokens <= max_tokens:
+            return encoding.decode(tokens)
+
+        # Same keep-start/keep-end policy as truncate_to_token_limit,
+        # applied to the already-encoded token list
+        keep_start_tokens = self._keep_start
+        keep_end_tokens = self._keep_end
+        marker = f"\n\n[... Content truncated: {current_tokens} tokens → {max_tokens} tokens ...]\n\n"
+
+        start_part = encoding.decode(tokens[:keep_start_tokens])
+        end_part = encoding.decode(tokens[-keep_end_tokens:])
+        return f"{start_part}{marker}{end_part}"